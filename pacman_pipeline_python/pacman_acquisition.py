@@ -4,7 +4,7 @@ import numpy as np
 from churchland_pipeline_python import lab, acquisition, equipment, reference, processing
 from churchland_pipeline_python.utilities import speedgoat, datajointutils
 from decimal import Decimal
-from functools import reduce
+from functools import lru_cache, reduce
 from typing import Tuple, List
 
 DataJointTable = dj.user_tables.UserTable
@@ -431,7 +431,11 @@ class ConditionParams(dj.Lookup):
         return cond_attr, cond_rel, targ_type_rel
     
     @classmethod
+    @lru_cache(maxsize=256)
     def target_force_profile(self, condition_id: int, fs: int):
+        """Constructs the condition time vector and target force profile at a sample rate.
+        Memoized, since condition parameters are immutable once inserted; the returned
+        arrays are marked read-only (copy before mutating)."""
 
         # ensure integer frequency
         assert fs == round(fs), 'Non-integer frequency'
@@ -503,6 +507,10 @@ class ConditionParams(dj.Lookup):
         # round time to maximum temporal precision
         t = t.round(int(np.ceil(np.log10(fs))))
 
+        # mark the memoized arrays read-only so callers cannot corrupt the cache
+        t.flags.writeable = False
+        force.flags.writeable = False
+
         return t, force
 
 
@@ -50,22 +50,24 @@ class Force(dj.Computed):
 
         # filter raw data
         fs = (acquisition.BehaviorRecording & key).fetch1('behavior_recording_sample_rate')
-        [frc.update(force_filt_offline=filter_rel().filt(frc['force_raw_online'], fs)) for frc in force_data];
+        for frc in force_data:
+            frc.update(force_filt_offline=filter_rel().filt(frc['force_raw_online'], fs))
 
         # fetch alignment indices and cast as integers
         behavior_alignment = (trial_source).fetch('behavior_alignment', order_by='trial')
         behavior_alignment = list(map(lambda x: x.astype(int), behavior_alignment))
 
         # append key and align raw and filtered forces
-        [frc.update(
-            force_raw=frc['force_raw_online'][align_idx],
-            force_filt=frc['force_filt_offline'][align_idx]
-        )
-        for frc, align_idx in zip(force_data, behavior_alignment)];
+        for frc, align_idx in zip(force_data, behavior_alignment):
+            frc.update(
+                force_raw=frc['force_raw_online'][align_idx],
+                force_filt=frc['force_filt_offline'][align_idx]
+            )
 
         # pop pre-aligned data
         for f_key in ['force_raw_online', 'force_filt_offline']:
-            [frc.pop(f_key) for frc in force_data]
+            for frc in force_data:
+                frc.pop(f_key)
 
         # merge key with force data
         key = [dict(key, **frc) for frc in force_data]
@@ -190,7 +192,8 @@ class ForceMean(dj.Computed):
 
                 # interpolate forces to new timebase as needed
                 if fs is not None:
-                    [X.update(force_filt_mean=np.interp(t_new, X['t_old'], X['force_filt_mean'])) for X in force_data];
+                    for X in force_data:
+                        X.update(force_filt_mean=np.interp(t_new, X['t_old'], X['force_filt_mean']))
 
                 # extract forces and append to list
                 forces.append(np.array([X['force_filt_mean'] for X in force_data]))
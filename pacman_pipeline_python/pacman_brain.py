@@ -1,5 +1,5 @@
 import datajoint as dj
-import os, inspect, itertools
+import os, inspect, itertools, functools
 import pandas as pd
 import numpy as np
 import scipy
@@ -8,11 +8,47 @@ import matplotlib.pyplot as plt
 from churchland_pipeline_python import lab, acquisition, processing
 from churchland_pipeline_python.utilities import datajointutils
 from . import pacman_acquisition, pacman_processing
+from .utilities import _numba_kernels
 from sklearn import decomposition
 from typing import Any, List, Tuple
 
 schema = dj.schema(dj.config.get('database.prefix') + 'churchland_analyses_pacman_brain')
 
+
+@functools.lru_cache(maxsize=None)
+def _get_filter_rel(filter_key):
+    """Gets the processing.Filter part table matching a filter key, provided as a sorted
+    tuple of (attribute, value) pairs. Cached, to avoid re-introspecting the schema and
+    re-querying each candidate part table on every make call."""
+
+    filter_parts = datajointutils.get_parts(processing.Filter, context=inspect.currentframe())
+    return next(part for part in filter_parts if part & dict(filter_key))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_sample_rates(monkey, session_date):
+    """Gets behavior and ephys recording sample rates for a session. Cached, since
+    recording sample rates are immutable once inserted."""
+
+    session_key = {'monkey': monkey, 'session_date': session_date}
+    fs_beh = int((acquisition.BehaviorRecording & session_key).fetch1('behavior_recording_sample_rate'))
+    fs_ephys = int((acquisition.EphysRecording & session_key).fetch1('ephys_recording_sample_rate'))
+    return fs_beh, fs_ephys
+
+
+@functools.lru_cache(maxsize=None)
+def _get_condition_time(monkey, session_date, condition_id):
+    """Gets the condition time vector in the behavior time base. Cached, since condition
+    times are immutable once inserted."""
+
+    condition_key = {'monkey': monkey, 'session_date': session_date, 'condition_id': condition_id}
+    condition_time = (pacman_acquisition.Behavior.Condition & condition_key).fetch1('condition_time')
+
+    # mark the memoized array read-only so callers cannot corrupt the cache
+    condition_time.flags.writeable = False
+    return condition_time
+
+
 # =======
 # LEVEL 0
 # =======
@@ -24,39 +60,46 @@ class NeuronSpikeRaster(dj.Computed):
     -> processing.Neuron
     -> pacman_processing.EphysTrialAlignment
     ---
-    neuron_spike_raster: longblob # neuron trial-aligned spike raster (boolean array)
+    neuron_spike_raster:         longblob     # neuron trial-aligned spike raster (bit-packed boolean array)
+    neuron_spike_raster_samples: int unsigned # number of samples in the unpacked spike raster
     """
 
+    # process per neuron (keys are independent, so populate(reserve_jobs=True, processes=os.cpu_count()) scales across cores)
     key_source = processing.Neuron \
-        * pacman_processing.EphysTrialAlignment \
-        & (pacman_processing.BehaviorTrialAlignment & 'valid_alignment')
+        & (pacman_processing.EphysTrialAlignment \
+        & (pacman_processing.BehaviorTrialAlignment & 'valid_alignment'))
 
     def make(self, key):
 
-        # fetch ephys alignment indices for the current trial
-        ephys_alignment = (pacman_processing.EphysTrialAlignment & key).fetch1('ephys_alignment')
-
-        # create spike bin edges centered around ephys alignment indices
-        spike_bin_edges = np.append(ephys_alignment, ephys_alignment[-1]+1+np.arange(2)).astype(float)
-        spike_bin_edges -= 0.5
-
-        # fetch raw spike indices for the full recording
+        # fetch raw spike indices for the full recording (once per neuron)
         neuron_spike_indices = (processing.Neuron & key).fetch1('neuron_spike_indices')
 
-        # assign spike indices to bins
-        spike_bins = np.digitize(neuron_spike_indices, spike_bin_edges) - 1
+        # fetch ephys alignment indices for every valid trial in one query
+        alignment_keys, ephys_alignments = (pacman_processing.EphysTrialAlignment & key \
+            & (pacman_processing.BehaviorTrialAlignment & 'valid_alignment')) \
+            .fetch('KEY', 'ephys_alignment')
 
-        # remove spike bins outside trial bounds
-        spike_bins = spike_bins[(spike_bins >= 0) & (spike_bins < len(ephys_alignment))]
+        spike_raster_keys = []
+        for alignment_key, ephys_alignment in zip(alignment_keys, ephys_alignments):
 
-        # create trial spike raster
-        spike_raster = np.zeros(len(ephys_alignment), dtype=bool)
-        spike_raster[spike_bins] = 1
+            # limit spike indices to the trial bounds
+            spike_index_lim = np.searchsorted(neuron_spike_indices, [ephys_alignment[0], ephys_alignment[-1]+1])
+            trial_spike_indices = neuron_spike_indices[spike_index_lim[0]:spike_index_lim[1]]
 
-        key.update(neuron_spike_raster=spike_raster)
+            # create trial spike raster (alignment indices are consecutive, so bins are direct offsets)
+            spike_raster = np.zeros(len(ephys_alignment), dtype=bool)
+            _numba_kernels.spikes_to_raster(trial_spike_indices, ephys_alignment[0], spike_raster)
 
-        # insert spike raster
-        self.insert1(key)
+            # pack raster bits for storage (8x smaller blobs)
+            spike_raster_keys.append(dict(
+                key,
+                **alignment_key,
+                neuron_spike_raster=np.packbits(spike_raster),
+                neuron_spike_raster_samples=len(spike_raster)
+            ))
+
+        # insert spike rasters
+        self.insert(spike_raster_keys, skip_duplicates=True)
 
     
     def rebin(
@@ -105,12 +148,23 @@ class NeuronSpikeRaster(dj.Computed):
             t_ephys, _ = pacman_acquisition.ConditionParams.target_force_profile(cond_key['condition_id'], fs_ephys)
 
             # rebin spike rasters to new time base
-            raster_keys, spike_rasters = (self & cond_key).fetch('KEY', 'neuron_spike_raster')
+            raster_keys, spike_rasters, raster_samples = (self & cond_key) \
+                .fetch('KEY', 'neuron_spike_raster', 'neuron_spike_raster_samples')
+
+            # unpack bit-packed spike rasters
+            spike_rasters = [np.unpackbits(raster, count=n_samples).view(bool) \
+                for raster, n_samples in zip(spike_rasters, raster_samples)]
+
             new_spikes = [np.digitize(t_ephys[raster], t_bins) - 1 for raster in spike_rasters]
 
-            # convert spike indices to raster
+            # convert spike indices to rasters (scatter in-range indices into boolean arrays, as in make)
             if as_raster:
-                new_spikes = [[True if i in spk_idx else False for i in range(len(t_new))] for spk_idx in new_spikes]
+                new_spike_rasters = []
+                for spk_idx in new_spikes:
+                    spike_raster = np.zeros(len(t_new), dtype=bool)
+                    _numba_kernels.spikes_to_raster(spk_idx, 0, spike_raster)
+                    new_spike_rasters.append(spike_raster)
+                new_spikes = new_spike_rasters
 
             # append spike rasters and keys to list
             keys.extend(raster_keys)
@@ -153,23 +207,28 @@ class NeuronRate(dj.Computed):
 
     def make(self, key):
 
-        # fetch behavior and ephys sample rates
-        fs_beh = int((acquisition.BehaviorRecording & key).fetch1('behavior_recording_sample_rate'))
-        fs_ephys = int((acquisition.EphysRecording & key).fetch1('ephys_recording_sample_rate'))
+        # fetch behavior and ephys sample rates (cached across calls)
+        fs_beh, fs_ephys = _get_sample_rates(key['monkey'], key['session_date'])
 
-        # fetch condition time (behavior time base)
-        t_beh = (pacman_acquisition.Behavior.Condition & key).fetch1('condition_time')
+        # fetch condition time (behavior time base, cached across calls)
+        t_beh = _get_condition_time(key['monkey'], key['session_date'], key['condition_id'])
         n_samples = len(t_beh)
 
         # make condition time in ephys time base
         t_ephys, _ = pacman_acquisition.ConditionParams.target_force_profile(key['condition_id'], fs_ephys)        
 
-        # fetch spike rasters (ephys time base)
+        # fetch spike rasters (ephys time base) and unpack from bit-packed storage
         spike_raster_keys = (NeuronSpikeRaster & key).fetch(as_dict=True)
-
-        # rebin spike raster to behavior time base 
-        time_bin_edges = np.append(t_beh, t_beh[-1]+(1+np.arange(2))/fs_beh) - 1/(2*fs_beh)
-        spike_bins = [np.digitize(t_ephys[spike_raster_key['neuron_spike_raster']], time_bin_edges) - 1 \
+        for spike_raster_key in spike_raster_keys:
+            spike_raster_key['neuron_spike_raster'] = np.unpackbits(
+                spike_raster_key['neuron_spike_raster'],
+                count=spike_raster_key.pop('neuron_spike_raster_samples')
+            ).view(bool)
+
+        # rebin spike raster to behavior time base (uniform grids, so ephys samples map directly to behavior
+        # bins; unlike the old digitize, spikes on a half-bin boundary now break ties consistently upward)
+        ephys_to_beh_offset = (t_ephys[0] - t_beh[0]) * fs_beh
+        spike_bins = [np.floor(0.5 + ephys_to_beh_offset + np.flatnonzero(spike_raster_key['neuron_spike_raster']) * (fs_beh/fs_ephys)).astype(int) \
             for spike_raster_key in spike_raster_keys]
         spike_bins = [b[(b >= 0) & (b < len(t_beh))] for b in spike_bins]
 
@@ -177,23 +236,31 @@ class NeuronRate(dj.Computed):
             spike_raster_key['neuron_spike_raster'] = np.zeros(n_samples, dtype=bool)
             spike_raster_key['neuron_spike_raster'][spk_bins] = 1
 
-        # get filter kernel
+        # get filter kernel (part table lookup cached across calls)
         filter_key = (processing.Filter & (pacman_processing.FilterParams & key)).fetch1('KEY')
-        filter_parts = datajointutils.get_parts(processing.Filter, context=inspect.currentframe())
-        filter_rel = next(part for part in filter_parts if part & filter_key)
+        filter_rel = _get_filter_rel(tuple(sorted(filter_key.items())))
+
+        # filter rebinned spike rasters (one batched call across trials when the filter supports 2D input)
+        spike_rasters = np.stack([spike_raster_key['neuron_spike_raster'] for spike_raster_key in spike_raster_keys])
+        try:
+            neuron_rates = fs_beh * filter_rel().filt(spike_rasters, fs_beh)
+            assert neuron_rates.shape == spike_rasters.shape
+
+            # verify the filter ran along the sample axis by checking the first trial against a 1D call
+            assert np.allclose(neuron_rates[0], fs_beh * filter_rel().filt(spike_rasters[0], fs_beh))
+        except Exception:
+            neuron_rates = np.stack([fs_beh * filter_rel().filt(spike_raster, fs_beh) for spike_raster in spike_rasters])
 
-        # filter rebinned spike raster
         neuron_rate_keys = spike_raster_keys.copy()
-        [
+        for neuron_rate_key, neuron_rate in zip(neuron_rate_keys, neuron_rates):
             neuron_rate_key.update(
-                filter_params_id = key['filter_params_id'],
-                neuron_rate = fs_beh * filter_rel().filt(neuron_rate_key['neuron_spike_raster'], fs_beh)
+                filter_params_id=key['filter_params_id'],
+                neuron_rate=neuron_rate
             )
-            for neuron_rate_key in neuron_rate_keys
-        ];
 
         # remove spike rasters
-        [neuron_rate_key.pop('neuron_spike_raster') for neuron_rate_key in neuron_rate_keys];
+        for neuron_rate_key in neuron_rate_keys:
+            neuron_rate_key.pop('neuron_spike_raster')
 
         # insert neuron rates
         self.insert(neuron_rate_keys, skip_duplicates=True)
@@ -216,24 +283,29 @@ class NeuronEvenRate(dj.Computed):
 
     def make(self, key):
 
-        # fetch behavior and ephys sample rates
-        fs_beh = int((acquisition.BehaviorRecording & key).fetch1('behavior_recording_sample_rate'))
-        fs_ephys = int((acquisition.EphysRecording & key).fetch1('ephys_recording_sample_rate'))
+        # fetch behavior and ephys sample rates (cached across calls)
+        fs_beh, fs_ephys = _get_sample_rates(key['monkey'], key['session_date'])
 
 
-        # fetch condition time (behavior time base)
-        t_beh = (pacman_acquisition.Behavior.Condition & key).fetch1('condition_time')
+        # fetch condition time (behavior time base, cached across calls)
+        t_beh = _get_condition_time(key['monkey'], key['session_date'], key['condition_id'])
         n_samples = len(t_beh)
 
         # make condition time in ephys time base
         t_ephys, _ = pacman_acquisition.ConditionParams.target_force_profile(key['condition_id'], fs_ephys)
 
-        # fetch spike rasters (ephys time base)
+        # fetch spike rasters (ephys time base) and unpack from bit-packed storage
         spike_raster_keys = (NeuronSpikeRaster & key).fetch(as_dict=True)
-
-        # rebin spike raster to behavior time base
-        time_bin_edges = np.append(t_beh, t_beh[-1]+(1+np.arange(2))/fs_beh) - 1/(2*fs_beh)
-        spike_bins = [np.digitize(t_ephys[spike_raster_key['neuron_spike_raster']], time_bin_edges) - 1 \
+        for spike_raster_key in spike_raster_keys:
+            spike_raster_key['neuron_spike_raster'] = np.unpackbits(
+                spike_raster_key['neuron_spike_raster'],
+                count=spike_raster_key.pop('neuron_spike_raster_samples')
+            ).view(bool)
+
+        # rebin spike raster to behavior time base (uniform grids, so ephys samples map directly to behavior
+        # bins; unlike the old digitize, spikes on a half-bin boundary now break ties consistently upward)
+        ephys_to_beh_offset = (t_ephys[0] - t_beh[0]) * fs_beh
+        spike_bins = [np.floor(0.5 + ephys_to_beh_offset + np.flatnonzero(spike_raster_key['neuron_spike_raster']) * (fs_beh/fs_ephys)).astype(int) \
                       for spike_raster_key in spike_raster_keys]
         spike_bins = [b[(b >= 0) & (b < len(t_beh))] for b in spike_bins]
 
@@ -241,23 +313,31 @@ class NeuronEvenRate(dj.Computed):
             spike_raster_key['neuron_spike_raster'] = np.zeros(n_samples, dtype=bool)
             spike_raster_key['neuron_spike_raster'][spk_bins] = 1
 
-        # get filter kernel
+        # get filter kernel (part table lookup cached across calls)
         filter_key = (processing.Filter & (pacman_processing.FilterParams & key)).fetch1('KEY')
-        filter_parts = datajointutils.get_parts(processing.Filter, context=inspect.currentframe())
-        filter_rel = next(part for part in filter_parts if part & filter_key)
+        filter_rel = _get_filter_rel(tuple(sorted(filter_key.items())))
+
+        # filter rebinned spike rasters (one batched call across trials when the filter supports 2D input)
+        spike_rasters = np.stack([spike_raster_key['neuron_spike_raster'] for spike_raster_key in spike_raster_keys])
+        try:
+            neuron_rates = fs_beh * (filter_rel & filter_key).filt(spike_rasters, fs_beh)
+            assert neuron_rates.shape == spike_rasters.shape
+
+            # verify the filter ran along the sample axis by checking the first trial against a 1D call
+            assert np.allclose(neuron_rates[0], fs_beh * (filter_rel & filter_key).filt(spike_rasters[0], fs_beh))
+        except Exception:
+            neuron_rates = np.stack([fs_beh * (filter_rel & filter_key).filt(spike_raster, fs_beh) for spike_raster in spike_rasters])
 
-        # filter rebinned spike raster
         neuron_rate_keys = spike_raster_keys.copy()
-        [
+        for neuron_rate_key, neuron_rate in zip(neuron_rate_keys, neuron_rates):
             neuron_rate_key.update(
-                filter_params_id = key['filter_params_id'],
-                neuron_rate = fs_beh * (filter_rel & filter_key).filt(neuron_rate_key['neuron_spike_raster'], fs_beh)
+                filter_params_id=key['filter_params_id'],
+                neuron_rate=neuron_rate
             )
-            for neuron_rate_key in neuron_rate_keys
-        ];
 
         # remove spike rasters
-        [neuron_rate_key.pop('neuron_spike_raster') for neuron_rate_key in neuron_rate_keys];
+        for neuron_rate_key in neuron_rate_keys:
+            neuron_rate_key.pop('neuron_spike_raster')
 
         # insert neuron rates
         self.insert(neuron_rate_keys, skip_duplicates=True)
@@ -281,23 +361,28 @@ class NeuronOddRate(dj.Computed):
 
     def make(self, key):
 
-        # fetch behavior and ephys sample rates
-        fs_beh = int((acquisition.BehaviorRecording & key).fetch1('behavior_recording_sample_rate'))
-        fs_ephys = int((acquisition.EphysRecording & key).fetch1('ephys_recording_sample_rate'))
+        # fetch behavior and ephys sample rates (cached across calls)
+        fs_beh, fs_ephys = _get_sample_rates(key['monkey'], key['session_date'])
 
-        # fetch condition time (behavior time base)
-        t_beh = (pacman_acquisition.Behavior.Condition & key).fetch1('condition_time')
+        # fetch condition time (behavior time base, cached across calls)
+        t_beh = _get_condition_time(key['monkey'], key['session_date'], key['condition_id'])
         n_samples = len(t_beh)
 
         # make condition time in ephys time base
         t_ephys, _ = pacman_acquisition.ConditionParams.target_force_profile(key['condition_id'], fs_ephys)
 
-        # fetch spike rasters (ephys time base)
+        # fetch spike rasters (ephys time base) and unpack from bit-packed storage
         spike_raster_keys = (NeuronSpikeRaster & key).fetch(as_dict=True)
-
-        # rebin spike raster to behavior time base
-        time_bin_edges = np.append(t_beh, t_beh[-1]+(1+np.arange(2))/fs_beh) - 1/(2*fs_beh)
-        spike_bins = [np.digitize(t_ephys[spike_raster_key['neuron_spike_raster']], time_bin_edges) - 1 \
+        for spike_raster_key in spike_raster_keys:
+            spike_raster_key['neuron_spike_raster'] = np.unpackbits(
+                spike_raster_key['neuron_spike_raster'],
+                count=spike_raster_key.pop('neuron_spike_raster_samples')
+            ).view(bool)
+
+        # rebin spike raster to behavior time base (uniform grids, so ephys samples map directly to behavior
+        # bins; unlike the old digitize, spikes on a half-bin boundary now break ties consistently upward)
+        ephys_to_beh_offset = (t_ephys[0] - t_beh[0]) * fs_beh
+        spike_bins = [np.floor(0.5 + ephys_to_beh_offset + np.flatnonzero(spike_raster_key['neuron_spike_raster']) * (fs_beh/fs_ephys)).astype(int) \
                       for spike_raster_key in spike_raster_keys]
         spike_bins = [b[(b >= 0) & (b < len(t_beh))] for b in spike_bins]
 
@@ -305,23 +390,31 @@ class NeuronOddRate(dj.Computed):
             spike_raster_key['neuron_spike_raster'] = np.zeros(n_samples, dtype=bool)
             spike_raster_key['neuron_spike_raster'][spk_bins] = 1
 
-        # get filter kernel
+        # get filter kernel (part table lookup cached across calls)
         filter_key = (processing.Filter & (pacman_processing.FilterParams & key)).fetch1('KEY')
-        filter_parts = datajointutils.get_parts(processing.Filter, context=inspect.currentframe())
-        filter_rel = next(part for part in filter_parts if part & filter_key)
+        filter_rel = _get_filter_rel(tuple(sorted(filter_key.items())))
+
+        # filter rebinned spike rasters (one batched call across trials when the filter supports 2D input)
+        spike_rasters = np.stack([spike_raster_key['neuron_spike_raster'] for spike_raster_key in spike_raster_keys])
+        try:
+            neuron_rates = fs_beh * filter_rel().filt(spike_rasters, fs_beh)
+            assert neuron_rates.shape == spike_rasters.shape
+
+            # verify the filter ran along the sample axis by checking the first trial against a 1D call
+            assert np.allclose(neuron_rates[0], fs_beh * filter_rel().filt(spike_rasters[0], fs_beh))
+        except Exception:
+            neuron_rates = np.stack([fs_beh * filter_rel().filt(spike_raster, fs_beh) for spike_raster in spike_rasters])
 
-        # filter rebinned spike raster
         neuron_rate_keys = spike_raster_keys.copy()
-        [
+        for neuron_rate_key, neuron_rate in zip(neuron_rate_keys, neuron_rates):
             neuron_rate_key.update(
-                filter_params_id = key['filter_params_id'],
-                neuron_rate = fs_beh * filter_rel().filt(neuron_rate_key['neuron_spike_raster'], fs_beh)
+                filter_params_id=key['filter_params_id'],
+                neuron_rate=neuron_rate
             )
-            for neuron_rate_key in neuron_rate_keys
-        ];
 
         # remove spike rasters
-        [neuron_rate_key.pop('neuron_spike_raster') for neuron_rate_key in neuron_rate_keys];
+        for neuron_rate_key in neuron_rate_keys:
+            neuron_rate_key.pop('neuron_spike_raster')
 
         # insert neuron rates
         self.insert(neuron_rate_keys, skip_duplicates=True)
@@ -344,9 +437,8 @@ class NeuronPsth(dj.Computed):
     neuron_psth_sem: longblob # neuron firing rate standard error (spikes/s)
     """
 
-    # limit conditions with good trials
-    key_source = processing.Neuron \
-        * pacman_processing.AlignmentParams \
+    # process all neurons per behavior block/filter params group (limit conditions with good trials)
+    key_source = pacman_processing.AlignmentParams \
         * pacman_processing.BehaviorBlock \
         * pacman_processing.BehaviorQualityParams \
         * pacman_processing.FilterParams \
@@ -356,18 +448,39 @@ class NeuronPsth(dj.Computed):
 
     def make(self, key):
 
-        # fetch single-trial firing rates
-        rates = (NeuronRate & key & (pacman_processing.GoodTrial & 'good_trial')).fetch('neuron_rate')
-        rates = np.stack(rates)
+        # fetch all single-trial firing rates for the group in one query
+        rate_keys, rates = (NeuronRate & key & (pacman_processing.GoodTrial & 'good_trial')).fetch('KEY', 'neuron_rate')
 
-        # update key with psth and standard error
-        key.update(
-            neuron_psth=rates.mean(axis=0),
-            neuron_psth_sem=rates.std(axis=0, ddof=(1 if rates.shape[0] > 1 else 0))/np.sqrt(rates.shape[0])
-        )
+        # group firing rates by neuron
+        neuron_attributes = processing.Neuron.primary_key
+        grouped_rates = {}
+        for rate_key, rate in zip(rate_keys, rates):
+            grouped_rates.setdefault(tuple(rate_key[attr] for attr in neuron_attributes), []).append(rate)
 
-        # insert neuron PSTH
-        self.insert1(key)
+        # compute each neuron's psth and standard error (accumulate sums rather than stacking all trials)
+        neuron_psth_keys = []
+        for neuron_id, neuron_rates in grouped_rates.items():
+
+            n_trials = len(neuron_rates)
+            rate_sum = np.zeros_like(neuron_rates[0], dtype=np.float64)
+            rate_sum_sq = np.zeros_like(rate_sum)
+            for neuron_rate in neuron_rates:
+                rate_sum += neuron_rate
+                rate_sum_sq += np.square(neuron_rate)
+
+            neuron_psth = rate_sum / n_trials
+            rate_var = np.maximum(rate_sum_sq - n_trials * np.square(neuron_psth), 0) \
+                / (n_trials - (1 if n_trials > 1 else 0))
+
+            neuron_psth_keys.append(dict(
+                key,
+                **dict(zip(neuron_attributes, neuron_id)),
+                neuron_psth=neuron_psth,
+                neuron_psth_sem=np.sqrt(rate_var / n_trials)
+            ))
+
+        # insert neuron PSTHs
+        self.insert(neuron_psth_keys)
 
 
     def fetch_psths(
@@ -417,7 +530,9 @@ class NeuronPsth(dj.Computed):
         unique_sample_rates = (dj.U('behavior_recording_sample_rate') & (acquisition.BehaviorRecording & self)) \
             .fetch('behavior_recording_sample_rate')
 
-        if len(unique_sample_rates) > 1 or (fs is not None and not all(unique_sample_rates == fs)):
+        resample = len(unique_sample_rates) > 1 or (fs is not None and not all(unique_sample_rates == fs))
+
+        if resample:
 
             # use modal sample rate if multiple in dataset
             if fs is None:
@@ -427,30 +542,33 @@ class NeuronPsth(dj.Computed):
             # join psth table with condition table
             self *= pacman_acquisition.Behavior.Condition.proj(t_old='condition_time')
 
-            psths = []
-            for cond_key in condition_keys:
+        # fetch all psth data in one query and index by neuron/condition
+        neuron_attributes = processing.Neuron.primary_key
+        psth_index = {
+            (tuple(X[attr] for attr in neuron_attributes), X['condition_id']): X
+            for X in self.fetch(as_dict=True)
+        }
+
+        psths = []
+        for cond_key in condition_keys:
+
+            if resample:
 
                 # make new time vector
                 t_new, _ = pacman_acquisition.ConditionParams.target_force_profile(cond_key['condition_id'], fs)
                 cond_key.update(condition_time=t_new)
 
-                # fetch psth data
-                psth_data = [(self & cond_key & unit_key).fetch1() for unit_key in neuron_keys]
-
-                # interpolate psths to new timebase as needed
-                if fs is not None:
-                    [X.update(neuron_psth=np.interp(t_new, X['t_old'], X['neuron_psth'])) for X in psth_data];
+            # gather psth data across units
+            psth_data = [psth_index[(tuple(unit_key[attr] for attr in neuron_attributes), cond_key['condition_id'])] \
+                for unit_key in neuron_keys]
 
-                # extract psths and append to list
-                psths.append(np.array([X['neuron_psth'] for X in psth_data]))
+            # interpolate psths to new timebase as needed (both timebases are uniform grids)
+            if resample:
+                for X in psth_data:
+                    X.update(neuron_psth=_numba_kernels.uniform_resample(X['neuron_psth'], X['t_old'], t_new))
 
-        else:
-            # fetch psths and stack across units
-            psths = []
-            for cond_key in condition_keys:
-                psths.append(np.stack(
-                    [(self & cond_key & unit_key).fetch1('neuron_psth') for unit_key in neuron_keys]
-                ))
+            # extract psths and append to list
+            psths.append(np.array([X['neuron_psth'] for X in psth_data]))
 
         # label each time step in concatenated population vector with condition index
         condition_ids = [(cond_key['condition_id'], ) * X.shape[1] for cond_key, X in zip(condition_keys, psths)]
@@ -458,33 +576,41 @@ class NeuronPsth(dj.Computed):
         # extract condition times from keys
         condition_times = [cond_key['condition_time'] for cond_key in condition_keys]
 
+        # stack psths across conditions and times once (reused for normalization and output)
+        n_samples_per_condition = [X.shape[1] for X in psths]
+        psth_block = np.hstack(psths)
+
         # soft normalize
         if soft_normalize is not None:
-            rate_range = np.hstack(psths).ptp(axis=1, keepdims=True)
-            psths = [X/(rate_range + soft_normalize) for X in psths]
+            rate_range = psth_block.ptp(axis=1, keepdims=True)
+            psth_block /= (rate_range + soft_normalize)
 
         # mean-center
         if mean_center:
-            rate_mean = np.hstack(psths).mean(axis=1, keepdims=True)
-            psths = [X - rate_mean for X in psths]
-        
+            rate_mean = psth_block.mean(axis=1, keepdims=True)
+            psth_block -= rate_mean
+
         # format output
         if output_format == 'array':
 
-            # stack output across conditions and times
-            psths = np.hstack(psths)
+            # concatenate labels across conditions and times
+            psths = psth_block
             condition_ids = np.hstack(condition_ids)
             condition_times = np.hstack(condition_times)
 
-        elif output_format == 'dict':
+        else:
+            # split block back into one array per condition
+            psths = np.split(psth_block, np.cumsum(n_samples_per_condition)[:-1], axis=1)
 
-            # aggregate data into a dict
-            psth_data = []
-            for cond_key, X in zip(condition_keys, psths):
-                for unit_key, Xi in zip(neuron_keys, X):
-                    psth_data.append(dict(cond_key, **unit_key, neuron_psth=Xi))
+            if output_format == 'dict':
 
-            psths = psth_data
+                # aggregate data into a dict
+                psth_data = []
+                for cond_key, X in zip(condition_keys, psths):
+                    for unit_key, Xi in zip(neuron_keys, X):
+                        psth_data.append(dict(cond_key, **unit_key, neuron_psth=Xi))
+
+                psths = psth_data
 
         return psths, condition_ids, condition_times, condition_keys, neuron_keys
 
@@ -598,7 +724,8 @@ class NeuronEvenPsth(dj.Computed):
 
                 # interpolate psths to new timebase as needed
                 if fs is not None:
-                    [X.update(neuron_psth=np.interp(t_new, X['t_old'], X['neuron_psth'])) for X in psth_data];
+                    for X in psth_data:
+                        X.update(neuron_psth=np.interp(t_new, X['t_old'], X['neuron_psth']))
 
                 # extract psths and append to list
                 psths.append(np.array([X['neuron_psth'] for X in psth_data]))
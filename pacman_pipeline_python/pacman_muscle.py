@@ -8,6 +8,7 @@ import matplotlib.pyplot as plt
 from churchland_pipeline_python import lab, acquisition, processing, reference
 from churchland_pipeline_python.utilities import datajointutils
 from . import pacman_acquisition, pacman_processing
+from .utilities import _numba_kernels
 from sklearn import decomposition
 from typing import Any, List, Tuple
 
@@ -89,22 +90,16 @@ class MotorUnitSpikeRaster(dj.Computed):
         # fetch ephys alignment indices for the current trial
         ephys_alignment = (pacman_processing.EphysTrialAlignment & key).fetch1('ephys_alignment')
 
-        # create spike bin edges centered around ephys alignment indices
-        spike_bin_edges = np.append(ephys_alignment, ephys_alignment[-1]+1+np.arange(2)).astype(float)
-        spike_bin_edges -= 0.5
-
         # fetch raw spike indices for the full recording
         motor_unit_spike_indices = (processing.MotorUnit & key).fetch1('motor_unit_spike_indices')
 
-        # assign spike indices to bins
-        spike_bins = np.digitize(motor_unit_spike_indices, spike_bin_edges) - 1
-
-        # remove spike bins outside trial bounds
-        spike_bins = spike_bins[(spike_bins >= 0) & (spike_bins < len(ephys_alignment))]
+        # limit spike indices to the trial bounds
+        spike_index_lim = np.searchsorted(motor_unit_spike_indices, [ephys_alignment[0], ephys_alignment[-1]+1])
+        trial_spike_indices = motor_unit_spike_indices[spike_index_lim[0]:spike_index_lim[1]]
 
-        # create trial spike raster
+        # create trial spike raster (alignment indices are consecutive, so bins are direct offsets)
         spike_raster = np.zeros(len(ephys_alignment), dtype=bool)
-        spike_raster[spike_bins] = 1
+        _numba_kernels.spikes_to_raster(trial_spike_indices, ephys_alignment[0], spike_raster)
 
         key.update(motor_unit_spike_raster=spike_raster)
 
@@ -161,9 +156,14 @@ class MotorUnitSpikeRaster(dj.Computed):
             raster_keys, spike_rasters = (self & cond_key).fetch('KEY', 'motor_unit_spike_raster')
             new_spikes = [np.digitize(t_ephys[raster], t_bins) - 1 for raster in spike_rasters]
 
-            # convert spike indices to raster
+            # convert spike indices to rasters (scatter in-range indices into boolean arrays, as in make)
             if as_raster:
-                new_spikes = [[True if i in spk_idx else False for i in range(len(t_new))] for spk_idx in new_spikes]
+                new_spike_rasters = []
+                for spk_idx in new_spikes:
+                    spike_raster = np.zeros(len(t_new), dtype=bool)
+                    _numba_kernels.spikes_to_raster(spk_idx, 0, spike_raster)
+                    new_spike_rasters.append(spike_raster)
+                new_spikes = new_spike_rasters
 
             # append spike rasters and keys to list
             keys.extend(raster_keys)
@@ -213,11 +213,12 @@ class EmgEnvelope(dj.Computed):
         emg_attributes = (Emg & key).fetch(as_dict=True)
 
         # highpass filter and rectify raw emg signals
-        [emg_attr.update(emg_envelope=abs(processing.Filter.Butterworth().filt(emg_attr['emg_signal'], fs_ephys, order=2, low_cut=40)))
-            for emg_attr in emg_attributes];
+        for emg_attr in emg_attributes:
+            emg_attr.update(emg_envelope=abs(processing.Filter.Butterworth().filt(emg_attr['emg_signal'], fs_ephys, order=2, low_cut=40)))
 
         # remove raw emg signal
-        [emg_attr.pop('emg_signal') for emg_attr in emg_attributes];
+        for emg_attr in emg_attributes:
+            emg_attr.pop('emg_signal')
 
         # get filter kernel
         filter_key = (processing.Filter & (pacman_processing.FilterParams & key)).fetch1('KEY')
@@ -225,15 +226,15 @@ class EmgEnvelope(dj.Computed):
         filter_rel = next(part for part in filter_parts if part & filter_key)
 
         # smooth rectified emg signals to construct envelope and remove 
-        [emg_attr.update(
-            filter_params_id=key['filter_params_id'],
-            emg_envelope=filter_rel().filt(emg_attr['emg_envelope'], fs_ephys)
-        ) for emg_attr in emg_attributes];
+        for emg_attr in emg_attributes:
+            emg_attr.update(
+                filter_params_id=key['filter_params_id'],
+                emg_envelope=filter_rel().filt(emg_attr['emg_envelope'], fs_ephys)
+            )
 
         # resample emg to behavior time base
-        [emg_attr.update(
-            emg_envelope=np.interp(t_beh, t_ephys, emg_attr['emg_envelope'])
-        ) for emg_attr in emg_attributes];
+        for emg_attr in emg_attributes:
+            emg_attr.update(emg_envelope=np.interp(t_beh, t_ephys, emg_attr['emg_envelope']))
 
         # insert emg envelopes
         self.insert(emg_attributes)
@@ -288,16 +289,15 @@ class MotorUnitRate(dj.Computed):
 
         # filter rebinned spike raster
         motor_unit_rate_keys = spike_raster_keys.copy()
-        [
+        for motor_unit_rate_key in motor_unit_rate_keys:
             motor_unit_rate_key.update(
-                filter_params_id = key['filter_params_id'],
-                motor_unit_rate = fs_beh * filter_rel().filt(motor_unit_rate_key['motor_unit_spike_raster'], fs_beh)
+                filter_params_id=key['filter_params_id'],
+                motor_unit_rate=fs_beh * filter_rel().filt(motor_unit_rate_key['motor_unit_spike_raster'], fs_beh)
             )
-            for motor_unit_rate_key in motor_unit_rate_keys
-        ];
 
         # remove spike rasters
-        [motor_unit_rate_key.pop('motor_unit_spike_raster') for motor_unit_rate_key in motor_unit_rate_keys];
+        for motor_unit_rate_key in motor_unit_rate_keys:
+            motor_unit_rate_key.pop('motor_unit_spike_raster')
 
         # insert motor unit rates
         self.insert(motor_unit_rate_keys, skip_duplicates=True)
@@ -415,7 +415,8 @@ class EmgEnvelopeMean(dj.Computed):
 
                 # interpolate emgs to new timebase as needed
                 if fs is not None:
-                    [X.update(emg_envelope_mean=np.interp(t_new, X['t_old'], X['emg_envelope_mean'])) for X in emg_data];
+                    for X in emg_data:
+                        X.update(emg_envelope_mean=np.interp(t_new, X['t_old'], X['emg_envelope_mean']))
 
                 # extract emgs and append to list
                 emgs.append(np.array([X['emg_envelope_mean'] for X in emg_data]))
@@ -574,7 +575,8 @@ class MotorUnitPsth(dj.Computed):
 
                 # interpolate psths to new timebase as needed
                 if fs is not None:
-                    [X.update(motor_unit_psth=np.interp(t_new, X['t_old'], X['motor_unit_psth'])) for X in psth_data];
+                    for X in psth_data:
+                        X.update(motor_unit_psth=np.interp(t_new, X['t_old'], X['motor_unit_psth']))
 
                 # extract psths and append to list
                 psths.append(np.array([X['motor_unit_psth'] for X in psth_data]))
@@ -2,6 +2,7 @@ import datajoint as dj
 import os, re, inspect, itertools
 import pandas as pd
 import numpy as np
+import scipy.ndimage
 import neo
 import progressbar
 import matplotlib.pyplot as plt
@@ -98,7 +99,8 @@ class BehaviorBlock(dj.Manual):
 
         # filter keys by those in behavior table but not in behavior block table
         old_block_keys = (BehaviorBlock & {'monkey': monkey}).fetch('KEY')
-        [key.update(session_date=str(key['session_date'])) for key in old_block_keys];
+        for old_key in old_block_keys:
+            old_key.update(session_date=str(old_key['session_date']))
 
         new_block_keys = [(idx, key) for idx, key in new_block_keys
             if (pacman_acquisition.Behavior & key) and key not in old_block_keys]
@@ -436,14 +438,9 @@ class GoodTrial(dj.Computed):
         max_lag_samp = int(round(fs * max_lag_sec))
 
         # compute error tolerance for the condition (range of target force values within lag window)
-        n_samples = len(target_force)
-        err_tol = np.zeros(n_samples)
-
-        for idx in range(n_samples):
-
-            start_idx = max(0, idx-max_lag_samp)
-            stop_idx = min(n_samples-1, idx+max_lag_samp)+1
-            err_tol[idx] = target_force[start_idx:stop_idx].ptp()
+        lag_window = 1 + 2*max_lag_samp
+        err_tol = scipy.ndimage.maximum_filter1d(target_force, lag_window, mode='nearest') \
+            - scipy.ndimage.minimum_filter1d(target_force, lag_window, mode='nearest')
 
         # bound error tolerance
         err_tol = np.maximum(
@@ -0,0 +1,59 @@
+"""Numba-compiled inner kernels for spike raster binning, with NumPy fallbacks."""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+
+    @njit(cache=True, nogil=True)
+    def spikes_to_raster(spike_bins, start, out):
+        """Scatter spike bin indices, offset by start, into a preallocated boolean raster."""
+        n_samples = out.shape[0]
+        for spike_bin in spike_bins:
+            bin_idx = int(spike_bin - start)
+            if 0 <= bin_idx < n_samples:
+                out[bin_idx] = True
+
+    @njit(cache=True, nogil=True)
+    def _uniform_resample(x, t0_old, dt_old, t0_new, dt_new, out):
+        n_old = x.shape[0]
+        for i in range(out.shape[0]):
+            j = (t0_new + i * dt_new - t0_old) / dt_old
+            if j <= 0:
+                out[i] = x[0]
+            elif j >= n_old - 1:
+                out[i] = x[n_old - 1]
+            else:
+                k = int(j)
+                f = j - k
+                out[i] = x[k] * (1 - f) + x[k + 1] * f
+
+    def uniform_resample(x, t_old, t_new):
+        """Linearly resample x from one uniform time grid onto another, holding the end
+        values constant outside the old grid (as np.interp). Skips the per-sample binary
+        search by exploiting the uniform grid spacing."""
+        out = np.empty(len(t_new), dtype=np.float64)
+        _uniform_resample(
+            np.asarray(x, dtype=np.float64),
+            t_old[0], (t_old[-1] - t_old[0]) / (len(t_old) - 1),
+            t_new[0], (t_new[-1] - t_new[0]) / (len(t_new) - 1),
+            out
+        )
+        return out
+
+else:
+
+    def spikes_to_raster(spike_bins, start, out):
+        """Scatter spike bin indices, offset by start, into a preallocated boolean raster."""
+        spike_bins = (np.asarray(spike_bins) - start).astype(int)
+        out[spike_bins[(spike_bins >= 0) & (spike_bins < out.shape[0])]] = True
+
+    def uniform_resample(x, t_old, t_new):
+        """Linearly resample x from one uniform time grid onto another, holding the end
+        values constant outside the old grid (as np.interp)."""
+        return np.interp(t_new, t_old, x)
@@ -88,10 +88,14 @@ class NeuroDataArrayConstructor:
             session_arrays.append(xr.concat(condition_arrays, dim=time_coords[0]))
         
         self._raw_data_set = xr.Dataset(
-            {self.data_name: xr.concat(session_arrays, dim=unit_coords[0])}, 
+            {self.data_name: xr.concat(session_arrays, dim=unit_coords[0])},
             attrs={'sample_rate': self.sample_rate}
         )
 
+        # mark raw arrays read-only so shallow copies of the data set cannot mutate them
+        for var in self._raw_data_set.data_vars:
+            self._raw_data_set[var].values.flags.writeable = False
+
     def _make_session_unit_coords(self, unit_ids):
         unit_indexes, unit_index_names = self._ids_to_indexes(unit_ids)
         unit_indexes = self._correct_coord_datatypes(unit_ids[0], unit_indexes, unit_index_names)
@@ -183,7 +187,8 @@ class NeuroDataArrayConstructor:
         delattr(self, '_data_stats')
 
     def reset_data_set(self):
-        self.data_set = self._raw_data_set.copy(deep=True)
+        # shallow copy shares the read-only raw arrays; mutators copy each variable before writing
+        self.data_set = self._raw_data_set.copy(deep=False)
 
     @classmethod
     def from_datajoint_table(
@@ -237,32 +242,29 @@ class NeuroDataArrayConstructor:
             unit_keys = (dj.U(*unit_id_names) & table & session_key).fetch(as_dict=True, order_by=unit_id_names)
             unit_ids.append([[(name, key[name]) for name in unit_id_names] for key in unit_keys])
 
+            # fetch all conditions for the session in one query and index rows per condition
+            fetch_attrs = ['condition_id'] \
+                + (['trial'] if is_multi_trial else []) \
+                + (['sample_rate'] if fetch_times else []) \
+                + [data_name]
+            session_df = pd.DataFrame(dict(zip(fetch_attrs, (table & session_key).fetch(*fetch_attrs, order_by=unit_id_names))))
+
             condition_data = []
             for condition_key in condition_keys:
-                condition_table = table & session_key & condition_key
+                condition_df = session_df[session_df['condition_id'] == condition_key['condition_id']]
+                X = condition_df[data_name].to_numpy()
+                if fetch_times:
+                    for idx, fs in enumerate(condition_df['sample_rate'].to_numpy()):
+                        if fs != new_sample_rate:
+                            t_old = condition_times[(condition_key['condition_id'], fs)]
+                            t_new = condition_times[(condition_key['condition_id'], new_sample_rate)]
+                            X[idx] = np.interp(t_old, t_new, X[idx])
                 if is_multi_trial:
-                    if fetch_times:
-                        trial, sample_rates, X = condition_table.fetch('trial', 'sample_rate', data_name, order_by=unit_id_names)
-                        for idx, fs in enumerate(sample_rates):
-                            if fs != new_sample_rate:
-                                t_old = condition_times[(condition_key['condition_id'], fs)]
-                                t_new = condition_times[(condition_key['condition_id'], new_sample_rate)]
-                                X[idx] = np.interp(t_old, t_new, X[idx])
-                    else:
-                        trial, X = condition_table.fetch('trial', data_name, order_by=unit_id_names)
+                    trial = condition_df['trial'].to_numpy()
                     X = np.vstack(X)
                     X = [X[trial==tr,:] for tr in np.unique(trial)]
                     condition_data.append(np.stack(X, axis=2))
                 else:
-                    if fetch_times:
-                        sample_rates, X = condition_table.fetch('sample_rate', data_name, order_by=unit_id_names)
-                        for idx, fs in enumerate(sample_rates):
-                            if fs != new_sample_rate:
-                                t_old = condition_times[(condition_key['condition_id'], fs)]
-                                t_new = condition_times[(condition_key['condition_id'], new_sample_rate)]
-                                X[idx] = np.interp(t_old, t_new, X[idx])
-                    else:
-                        X = condition_table.fetch(data_name, order_by=unit_id_names)
                     condition_data.append(np.vstack(X))
 
             session_data.append(condition_data)
@@ -307,8 +309,13 @@ class NeuroDataArray(NeuroDataArrayConstructor):
                 'Reference variable {} not found in data set'.format(reference_var)
             data_means = {var: data_means[reference_var] for var in data_vars}
 
+        # subtract means in place on the underlying arrays (avoids xarray reallocating each variable)
         for var in data_vars:
-            self.data_set[var] -= data_means[var]
+            if not self.data_set[var].values.flags.writeable:
+                self.data_set[var] = self.data_set[var].copy()
+            data_values = self.data_set[var].values
+            data_mean = data_means[var].broadcast_like(self.data_set[var]).transpose(*self.data_set[var].dims).values
+            np.subtract(data_values, data_mean, out=data_values)
 
     def normalize(self, only_vars: list=None, reference_var: str=None, soft_factor: int=0):
         """Normalizes each data array by its cross-condition range.
@@ -329,8 +336,13 @@ class NeuroDataArray(NeuroDataArrayConstructor):
                 'Reference variable {} not found in data set'.format(reference_var)
             data_ranges = {var: data_ranges[reference_var] for var in data_vars}
 
+        # divide by ranges in place on the underlying arrays (avoids xarray reallocating each variable)
         for var in data_vars:
-            self.data_set[var] /= (soft_factor + data_ranges[var])
+            if not self.data_set[var].values.flags.writeable:
+                self.data_set[var] = self.data_set[var].copy()
+            data_values = self.data_set[var].values
+            data_range = data_ranges[var].broadcast_like(self.data_set[var]).transpose(*self.data_set[var].dims).values
+            np.divide(data_values, soft_factor + data_range, out=data_values)
 
     def project_pc_space(self, var_name: str, condition_ids: list=None, soft_factor: int=0, max_components: int=None):
         """Projects a data array into its principal component space and saves as a new data array.
@@ -359,12 +371,14 @@ class NeuroDataArray(NeuroDataArrayConstructor):
         
     def reorder_conditions(self, sorted_condition_ids: list):
         """Down selects and reorders data set by provided condition IDs."""
-        ct_indexes = np.vstack([np.array(ct) for ct in self.data_set.indexes['condition_time']])
-        sorted_ct_indexes = np.vstack([ct_indexes[ct_indexes[:,0]==cid,:] for cid in sorted_condition_ids])
-        sorted_ct_indexes = [ct for ct in sorted_ct_indexes.T]
-        sorted_ct_indexes[0] = sorted_ct_indexes[0].astype(int)
-        new_ct_indexes = pd.MultiIndex.from_arrays(sorted_ct_indexes, names=['condition_id', 'time'])
-        self.data_set = self.data_set.reindex(condition_time=new_ct_indexes)
+        condition_ids = self.data_set.indexes['condition_time'].get_level_values(0).to_numpy()
+
+        # condition blocks are contiguous along the index, so reordering is a concatenation of slices
+        block_starts = np.flatnonzero(np.concatenate(([True], condition_ids[1:] != condition_ids[:-1])))
+        block_stops = np.append(block_starts[1:], len(condition_ids))
+        condition_slices = {condition_ids[start]: (start, stop) for start, stop in zip(block_starts, block_stops)}
+        new_order = np.concatenate([np.arange(*condition_slices[cid]) for cid in sorted_condition_ids])
+        self.data_set = self.data_set.isel(condition_time=new_order)
 
     def trial_average(self, n_folds: int=1):
         assert 'trial' in self.data_set.coords, 'Only applicable for multi-trial data'